@@ -12,7 +12,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from PyQt5.QtWidgets import QApplication
 from src.gui.main_window import MainWindow
-from src.common.logging_config import setup_logging
+from src.common.logging_config import setup_logging, flush_logging
 
 
 def main():
@@ -22,6 +22,7 @@ def main():
     
     # 创建Qt应用程序
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(flush_logging)
     
     # 创建主窗口
     window = MainWindow()
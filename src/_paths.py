@@ -0,0 +1,4 @@
+from pathlib import Path
+
+# 项目根目录
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
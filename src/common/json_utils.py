@@ -0,0 +1,26 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def dump_json(data: Any, path: str) -> None:
+    """
+    将数据以缩进格式写入JSON文件
+    
+    安装了orjson时使用其编码，否则回退到标准库json
+    
+    Args:
+        data: 要写入的数据
+        path: 文件路径
+    """
+    if HAS_ORJSON:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
@@ -1,16 +1,42 @@
 import os
 import sys
+import re
+import queue
+import atexit
 import logging
 import logging.handlers
 from datetime import datetime
 from typing import Optional
 
-# 添加项目根目录到Python路径
-project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-sys.path.insert(0, project_root)
-
 from src.config.app_config import app_config
 
+# 日志级别名称到数值的映射（包含标准库支持的WARN、FATAL等别名）
+_LEVELS = {
+    name: getattr(logging, name)
+    for name in ('NOTSET', 'DEBUG', 'INFO', 'WARN', 'WARNING', 'ERROR', 'FATAL', 'CRITICAL')
+}
+
+# 只输出WARNING及以上级别的第三方库日志记录器
+_THIRD_PARTY_QUIET = ('urllib3', 'selenium', 'playwright')
+
+# 需要调用位置信息的日志记录属性
+_SOURCE_ATTRS = ('pathname', 'filename', 'module', 'funcName', 'lineno')
+
+# 文件大小字符串解析（后缀按从长到短匹配）
+_SIZE_RE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*(GB|MB|KB|B)\s*$', re.IGNORECASE)
+_SIZE_MULTIPLIERS = {
+    'B': 1,
+    'KB': 1024,
+    'MB': 1024 ** 2,
+    'GB': 1024 ** 3,
+}
+
+# 包装文件处理器的内存缓冲处理器
+_mem_handler: Optional[logging.handlers.MemoryHandler] = None
+
+# 在后台线程中执行实际写入的队列监听器
+_listener: Optional[logging.handlers.QueueListener] = None
+
 
 def setup_logging(
     level: Optional[str] = None,
@@ -25,6 +51,7 @@ def setup_logging(
         log_file: 日志文件名
         console_output: 是否输出到控制台
     """
+    global _mem_handler, _listener
     
     # 获取配置
     config = app_config.get_logging_config()
@@ -40,26 +67,40 @@ def setup_logging(
     
     log_path = os.path.join(logs_dir, log_file)
     
+    # 获取根日志记录器
+    root_logger = logging.getLogger()
+    root_logger.setLevel(_resolve_level(log_level))
+    
+    # 已针对同一日志文件完成配置时直接返回，避免重复打开文件
+    for handler in root_logger.handlers:
+        if getattr(handler, '_setup_marker', None) == log_path:
+            return
+    
     # 创建日志目录
     os.makedirs(os.path.dirname(log_path), exist_ok=True)
     
     # 创建格式化器
-    formatter = logging.Formatter(
-        config.get('format', '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    )
-    
-    # 获取根日志记录器
-    root_logger = logging.getLogger()
-    root_logger.setLevel(getattr(logging, log_level.upper()))
-    
-    # 清除现有的处理器
+    log_format = config.get('format', '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    formatter = logging.Formatter(log_format)
+    _disable_unused_record_info(log_format)
+    
+    # 清除现有的处理器（先停止监听器并关闭旧的缓冲和文件处理器，避免丢失日志）
+    _stop_listener()
+    if _mem_handler is not None:
+        old_file_handler = _mem_handler.target
+        _mem_handler.close()
+        old_file_handler.close()
+        _mem_handler = None
     root_logger.handlers.clear()
     
+    # 由监听器线程负责的实际输出处理器
+    handlers = []
+    
     # 控制台处理器
     if console_output:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(formatter)
-        root_logger.addHandler(console_handler)
+        handlers.append(console_handler)
     
     # 文件处理器
     if config.get('file_rotation', True):
@@ -78,12 +119,29 @@ def setup_logging(
         file_handler = logging.FileHandler(log_path, encoding='utf-8')
     
     file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
+    
+    # 使用内存缓冲批量写入文件，ERROR及以上级别立即刷新
+    _mem_handler = logging.handlers.MemoryHandler(
+        capacity=1000,
+        flushLevel=logging.ERROR,
+        target=file_handler,
+        flushOnClose=True
+    )
+    handlers.append(_mem_handler)
+    
+    # 调用线程只负责入队，磁盘和控制台I/O由监听器线程完成
+    log_queue = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler._setup_marker = log_path
+    root_logger.addHandler(queue_handler)
+    _listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
     
     # 设置第三方库的日志级别
-    logging.getLogger('urllib3').setLevel(logging.WARNING)
-    logging.getLogger('selenium').setLevel(logging.WARNING)
-    logging.getLogger('playwright').setLevel(logging.WARNING)
+    for name in _THIRD_PARTY_QUIET:
+        logging.getLogger(name).setLevel(logging.WARNING)
     
     # 记录启动信息
     logger = logging.getLogger(__name__)
@@ -94,6 +152,52 @@ def setup_logging(
     logger.info("=" * 60)
 
 
+def _disable_unused_record_info(log_format: str) -> None:
+    """
+    关闭日志格式中未使用的记录信息采集
+    
+    调用位置信息需要在每条日志记录时遍历调用栈，线程和进程信息也有额外开销
+    
+    Args:
+        log_format: 日志格式字符串
+    """
+    if not any(f'%({attr})' in log_format for attr in _SOURCE_ATTRS):
+        logging._srcfile = None
+    if '%(thread' not in log_format:
+        logging.logThreads = False
+    if '%(process)' not in log_format:
+        logging.logProcesses = False
+    if '%(processName)' not in log_format:
+        logging.logMultiprocessing = False
+
+
+def _resolve_level(level_name: str) -> int:
+    """
+    解析日志级别名称
+    
+    Args:
+        level_name: 日志级别名称，不区分大小写
+        
+    Returns:
+        int: 日志级别数值，无法识别时返回INFO
+    """
+    return _LEVELS.get(level_name.upper(), logging.INFO)
+
+
+def _stop_listener() -> None:
+    """停止队列监听器，处理完队列中剩余的日志"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def flush_logging() -> None:
+    """将内存缓冲中的日志写入文件"""
+    if _mem_handler is not None:
+        _mem_handler.flush()
+
+
 def _parse_file_size(size_str: str) -> int:
     """
     解析文件大小字符串
@@ -104,21 +208,9 @@ def _parse_file_size(size_str: str) -> int:
     Returns:
         int: 字节数
     """
-    size_str = size_str.upper().strip()
-    
-    multipliers = {
-        'B': 1,
-        'KB': 1024,
-        'MB': 1024 ** 2,
-        'GB': 1024 ** 3,
-    }
-    
-    for suffix, multiplier in multipliers.items():
-        if size_str.endswith(suffix):
-            try:
-                return int(float(size_str[:-len(suffix)]) * multiplier)
-            except ValueError:
-                pass
+    match = _SIZE_RE.match(size_str)
+    if match:
+        return int(float(match.group(1)) * _SIZE_MULTIPLIERS[match.group(2).upper()])
     
     return 10 * 1024 * 1024  # 默认10MB
 
@@ -148,6 +240,6 @@ def log_exception(logger: logging.Logger, message: str, exc_info: bool = True) -
     logger.error(message, exc_info=exc_info)
 
 
-# 模块初始化时设置默认日志
-if __name__ != "__main__":
-    setup_logging()
\ No newline at end of file
+# 退出前处理完队列并刷新缓冲日志（atexit按注册的逆序执行）
+atexit.register(flush_logging)
+atexit.register(_stop_listener)
\ No newline at end of file
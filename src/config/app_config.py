@@ -1,20 +1,46 @@
 import os
+import copy
 import json
+import functools
 from typing import Dict, Any
 
+from src._paths import PROJECT_ROOT
+from src.common.json_utils import dump_json
+
+# 配置文件所在的src目录
+_BASE_DIR = str(PROJECT_ROOT / "src")
+
+
+@functools.lru_cache(maxsize=16)
+def _resolve_and_mkdir(path_type: str, path_str: str, base_dir: str) -> str:
+    """解析路径为绝对路径并确保目录存在，每个进程对同一路径只执行一次"""
+    path = path_str
+    if not os.path.isabs(path):
+        # 相对路径转换为绝对路径
+        path = os.path.join(base_dir, path)
+    
+    # 确保目录存在
+    os.makedirs(path, exist_ok=True)
+    return path
+
 
 class AppConfig:
     """应用程序配置类"""
     
+    __slots__ = ('config_file', 'config', '_get_cache')
+    
     def __init__(self):
         self.config_file = self._get_config_path()
         self.config = self._load_config()
+        self._get_cache: Dict[str, Any] = {}
+        
+        # 预先缓存常用的配置分组
+        for section in ('chrome', 'logging', 'automation', 'ocr', 'image_recognition'):
+            self.get(section)
     
     def _get_config_path(self) -> str:
         """获取配置文件路径"""
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(current_dir)
-        return os.path.join(project_root, "config", "app_config.json")
+        return os.path.join(_BASE_DIR, "config", "app_config.json")
     
     def _load_config(self) -> Dict[str, Any]:
         """加载配置文件"""
@@ -56,17 +82,13 @@ class AppConfig:
         }
         
         try:
-            os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
-            
             if os.path.exists(self.config_file):
                 with open(self.config_file, 'r', encoding='utf-8') as f:
                     user_config = json.load(f)
                 # 合并配置
                 return self._merge_config(default_config, user_config)
             else:
-                # 创建默认配置文件
-                with open(self.config_file, 'w', encoding='utf-8') as f:
-                    json.dump(default_config, f, indent=2, ensure_ascii=False)
+                # 配置文件不存在时直接使用内存中的默认配置，首次save()时再写入文件
                 return default_config
                 
         except Exception as e:
@@ -74,31 +96,36 @@ class AppConfig:
             return default_config
     
     def _merge_config(self, default: Dict, user: Dict) -> Dict:
-        """合并配置"""
-        merged = default.copy()
+        """合并配置（使用栈迭代合并嵌套字典，原地修改默认配置的副本）"""
+        merged = copy.deepcopy(default)
+        stack = [(merged, user)]
         
-        def merge_dict(d1: Dict, d2: Dict) -> Dict:
-            """递归合并字典"""
+        while stack:
+            d1, d2 = stack.pop()
             for key, value in d2.items():
-                if key in d1 and isinstance(d1[key], dict) and isinstance(value, dict):
-                    d1[key] = merge_dict(d1[key], value)
+                if isinstance(value, dict) and isinstance(d1.get(key), dict):
+                    stack.append((d1[key], value))
                 else:
                     d1[key] = value
-            return d1
         
-        return merge_dict(merged, user)
+        return merged
     
     def get(self, key: str, default: Any = None) -> Any:
         """获取配置值"""
+        if key in self._get_cache:
+            return self._get_cache[key]
+        
         keys = key.split('.')
         value = self.config
         
         try:
             for k in keys:
                 value = value[k]
-            return value
         except (KeyError, TypeError):
             return default
+        
+        self._get_cache[key] = value
+        return value
     
     def set(self, key: str, value: Any) -> None:
         """设置配置值"""
@@ -111,18 +138,24 @@ class AppConfig:
             config = config[k]
         
         config[keys[-1]] = value
+        self._get_cache.clear()
         self.save()
     
     def save(self) -> bool:
         """保存配置到文件"""
+        self._get_cache.clear()
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
+            self._materialize_defaults()
+            dump_json(self.config, self.config_file)
             return True
         except Exception as e:
             print(f"保存配置文件失败: {e}")
             return False
     
+    def _materialize_defaults(self) -> None:
+        """首次保存时创建配置文件所在目录"""
+        os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
+    
     def get_chrome_config(self) -> Dict[str, Any]:
         """获取Chrome配置"""
         return self.get('chrome', {})
@@ -146,14 +179,8 @@ class AppConfig:
     def get_path(self, path_type: str) -> str:
         """获取路径配置"""
         path = self.get(f'paths.{path_type}', '')
-        if not os.path.isabs(path):
-            # 相对路径转换为绝对路径
-            current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            path = os.path.join(current_dir, path)
-        
-        # 确保目录存在
-        os.makedirs(path, exist_ok=True)
-        return path
+        # 相对路径以项目根目录为基准
+        return _resolve_and_mkdir(path_type, path, str(PROJECT_ROOT))
     
     def get_all_config(self) -> Dict[str, Any]:
         """获取所有配置"""
@@ -1,34 +1,72 @@
-import os
-import sys
-import json
 import logging
-from datetime import datetime
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
+from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QPushButton, QTextEdit, QLabel, 
                             QGroupBox, QGridLayout, QMessageBox, QFileDialog,
                             QProgressBar, QTabWidget, QSplitter)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt5.QtGui import QFont, QIcon
-
-# 添加项目根目录到Python路径
-project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-sys.path.insert(0, project_root)
+from PyQt5.QtCore import Qt, QThread, QObject, pyqtSignal, QTimer
+from PyQt5.QtGui import QFont, QIcon, QTextCursor
 
 from src.scripts.browser_automation_task import BrowserAutomationTask
-from src.common.logging_config import setup_logging
+from src.common.logging_config import flush_logging
+from src.config.app_config import app_config
 
 # 设置日志
 logger = logging.getLogger(__name__)
 
+
+class _LogSignalEmitter(QObject):
+    """日志信号发射器"""
+    
+    message_logged = pyqtSignal(str)
+
+
+class QtLogHandler(logging.Handler):
+    """将格式化后的日志记录通过Qt信号转发到界面"""
+    
+    def __init__(self):
+        super().__init__()
+        self.emitter = _LogSignalEmitter()
+        self.setFormatter(logging.Formatter(
+            '[%(asctime)s] [%(levelname)s] %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        ))
+    
+    def emit(self, record):
+        try:
+            self.emitter.message_logged.emit(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
 class MainWindow(QMainWindow):
     """主窗口类"""
     
+    # 状态文本框显示的日志行数
+    STATUS_TAIL_LINES = 100
+    
     def __init__(self):
         super().__init__()
         self.browser_task = None
+        self._status_dirty = False
         self.init_ui()
+        
+        # 界面日志由日志处理器转发到文本框
+        self.log_handler = QtLogHandler()
+        self.log_handler.emitter.message_logged.connect(self.append_log_line)
+        logger.addHandler(self.log_handler)
+        
         self.load_config()
         
+        # 定时将缓冲日志写入文件
+        self.log_flush_timer = QTimer(self)
+        self.log_flush_timer.timeout.connect(flush_logging)
+        self.log_flush_timer.start(30000)
+        
+        # 定时将完整日志的末尾同步到状态文本框
+        self.status_refresh_timer = QTimer(self)
+        self.status_refresh_timer.timeout.connect(self.refresh_status_text)
+        self.status_refresh_timer.start(300)
+        
     def init_ui(self):
         """初始化UI界面"""
         self.setWindowTitle('浏览器自动化测试工具')
@@ -189,6 +227,7 @@ class MainWindow(QMainWindow):
         self.status_text = QTextEdit()
         self.status_text.setReadOnly(True)
         self.status_text.setMaximumHeight(150)
+        self.status_text.document().setMaximumBlockCount(500)
         status_layout.addWidget(self.status_text)
         
         status_group.setLayout(status_layout)
@@ -216,6 +255,7 @@ class MainWindow(QMainWindow):
         self.full_log_text = QTextEdit()
         self.full_log_text.setReadOnly(True)
         self.full_log_text.setFont(QFont('Consolas', 10))
+        self.full_log_text.document().setMaximumBlockCount(5000)
         layout.addWidget(self.full_log_text)
         
         # 添加清除日志按钮
@@ -228,13 +268,9 @@ class MainWindow(QMainWindow):
     def load_config(self):
         """加载配置"""
         try:
-            config_path = os.path.join(project_root, 'config', 'app_config.json')
-            if os.path.exists(config_path):
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    self.config = json.load(f)
-            else:
-                self.config = {}
-                
+            # 复用全局配置实例，避免重复读取配置文件
+            self.config = app_config.get_all_config()
+            
             # 初始化日志
             self.log_message("配置加载完成")
             
@@ -243,18 +279,33 @@ class MainWindow(QMainWindow):
             self.config = {}
             
     def log_message(self, message, level="info"):
-        """记录日志消息"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        formatted_message = f"[{timestamp}] [{level.upper()}] {message}"
+        """记录日志消息（由日志处理器格式化并显示到界面）"""
+        logger.log(getattr(logging, level.upper()), message)
         
-        # 添加到状态文本框
-        self.status_text.append(formatted_message)
+    def append_log_line(self, text):
+        """追加一条已格式化的日志到完整日志（状态文本框由定时器同步末尾内容）"""
+        self.full_log_text.append(text)
+        self._status_dirty = True
         
-        # 添加到完整日志
-        self.full_log_text.append(formatted_message)
+    def append_log_batch(self, text):
+        """追加任务线程批量发送的日志（已写入日志文件）"""
+        self.full_log_text.append(text)
+        self._status_dirty = True
         
-        # 记录到文件
-        logger.log(getattr(logging, level.upper()), message)
+    def refresh_status_text(self):
+        """将完整日志的末尾若干行同步到状态文本框"""
+        if not self._status_dirty:
+            return
+        self._status_dirty = False
+        
+        lines = []
+        block = self.full_log_text.document().lastBlock()
+        while block.isValid() and len(lines) < self.STATUS_TAIL_LINES:
+            lines.append(block.text())
+            block = block.previous()
+        
+        self.status_text.setPlainText("\n".join(reversed(lines)))
+        self.status_text.moveCursor(QTextCursor.End)
         
     def clear_logs(self):
         """清除日志"""
@@ -321,7 +372,7 @@ class MainWindow(QMainWindow):
             
             # 连接信号
             self.browser_task.progress_updated.connect(self.update_progress)
-            self.browser_task.log_message.connect(self.log_message)
+            self.browser_task.log_batch.connect(self.append_log_batch)
             self.browser_task.task_finished.connect(self.on_task_finished)
             
             # 启动任务
@@ -353,6 +404,11 @@ class MainWindow(QMainWindow):
         """更新进度条"""
         self.progress_bar.setValue(value)
         
+    def closeEvent(self, event):
+        """窗口关闭时移除界面日志处理器"""
+        logger.removeHandler(self.log_handler)
+        super().closeEvent(event)
+        
     def on_task_finished(self, success, message):
         """任务完成回调"""
         self.progress_bar.setVisible(False)
@@ -364,15 +420,3 @@ class MainWindow(QMainWindow):
         else:
             self.log_message(f"任务失败: {message}", level="error")
             QMessageBox.warning(self, "失败", f"任务执行失败！\n{message}")
-
-
-if __name__ == '__main__':
-    import sys
-    
-    # 设置日志
-    setup_logging()
-    
-    app = QApplication(sys.argv)
-    window = MainWindow()
-    window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
@@ -1,89 +1,167 @@
 import os
-import sys
-import json
 import time
+import socket
 import logging
 import subprocess
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
-from PyQt5.QtCore import QThread, pyqtSignal
-
-# 添加项目根目录到Python路径
-project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-sys.path.insert(0, project_root)
+from PyQt5.QtCore import QThread, QTimer, pyqtSignal
 
 from src.scripts.chrome_automation import ChromeAutomation
-from src.config.app_config import AppConfig
+from src.config.app_config import app_config
+from src.common.json_utils import dump_json
 
 logger = logging.getLogger(__name__)
 
+# Chrome调试端口范围
+CHROME_DEBUG_PORTS = range(9222, 9233)
+
+
+def _is_port_listening(port: int, host: str = '127.0.0.1', timeout: float = 0.05) -> bool:
+    """检测本地端口是否处于监听状态"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        return sock.connect_ex((host, port)) == 0
+
+
+@dataclass(slots=True)
+class PortResult:
+    """单个Chrome实例的任务执行结果"""
+    
+    port: int
+    start_time: str
+    status: str = 'success'
+    actions: List[Dict] = field(default_factory=list)
+    screenshots: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    end_time: str = ''
+    page_info: Optional[Dict] = None
+
 
 class BrowserAutomationTask(QThread):
     """浏览器自动化任务类"""
     
     # 信号定义
     progress_updated = pyqtSignal(int)
-    log_message = pyqtSignal(str)
+    log_batch = pyqtSignal(str)
     task_finished = pyqtSignal(bool, str)
     
+    # 日志批量发送间隔（毫秒）
+    LOG_FLUSH_INTERVAL_MS = 200
+    
     def __init__(self):
         super().__init__()
-        self.config = AppConfig()
-        self.chrome_automation = None
+        self.config = app_config
+        self._screenshot_dir = self.config.get_path('screenshots')
+        self._report_dir = self.config.get_path('reports')
+        self._automations = set()
+        self._automations_lock = threading.Lock()
         self.is_running = False
         self.task_results = []
+        self._last_progress = -1
+        
+        # 日志缓冲，由定时器批量发送到界面，避免逐条跨线程信号
+        self._log_buf: List[str] = []
+        self._log_lock = threading.Lock()
+        self._ts_second = 0
+        self._ts_text = ""
+        self._log_timer = QTimer()
+        self._log_timer.setInterval(self.LOG_FLUSH_INTERVAL_MS)
+        self._log_timer.timeout.connect(self._flush_log_buffer)
+        self.finished.connect(self._log_timer.stop)
+        self.finished.connect(self._flush_log_buffer)
+    
+    def start(self, *args, **kwargs):
+        """启动任务线程及日志刷新定时器"""
+        self._log_timer.start()
+        super().start(*args, **kwargs)
+    
+    def _queue_log(self, message: str, level: str = "info"):
+        """
+        缓冲日志消息
+        
+        Args:
+            message: 日志消息
+            level: 日志级别，error级别会立即发送
+        """
+        logger.log(getattr(logging, level.upper()), message)
+        
+        with self._log_lock:
+            # 时间戳字符串按秒缓存，同一秒内的消息不再重复格式化
+            now = int(time.time())
+            if now != self._ts_second:
+                self._ts_second = now
+                self._ts_text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+            self._log_buf.append(f"[{self._ts_text}] [{level.upper()}] {message}")
+        
+        if level == "error":
+            self._flush_log_buffer()
+    
+    def _flush_log_buffer(self):
+        """将缓冲的日志合并为一条消息发送"""
+        with self._log_lock:
+            if not self._log_buf:
+                return
+            text = "\n".join(self._log_buf)
+            self._log_buf.clear()
+        
+        self.log_batch.emit(text)
+        
+    def _emit_progress(self, value: int):
+        """更新进度，与上次相同的值不再跨线程发送"""
+        if value != self._last_progress:
+            self._last_progress = value
+            self.progress_updated.emit(value)
         
     def run(self):
         """执行浏览器自动化任务"""
         try:
             self.is_running = True
-            self.log_message.emit("开始执行浏览器自动化任务...")
+            self._last_progress = -1
+            self._queue_log("开始执行浏览器自动化任务...")
             
             # 步骤1: 检测Chrome实例
-            self.progress_updated.emit(10)
-            self.log_message.emit("正在检测Chrome实例...")
+            self._emit_progress(10)
+            self._queue_log("正在检测Chrome实例...")
             chrome_instances = self.detect_chrome_instances()
             
             if not chrome_instances:
-                self.log_message.emit("未检测到可用的Chrome实例，将启动新实例")
+                self._queue_log("未检测到可用的Chrome实例，将启动新实例")
                 chrome_instances = [9222]  # 默认端口
             
-            # 步骤2: 初始化Chrome自动化
-            self.progress_updated.emit(20)
-            self.chrome_automation = ChromeAutomation()
-            
-            # 步骤3: 执行自动化任务
-            for i, port in enumerate(chrome_instances):
-                self.log_message.emit(f"正在处理Chrome实例 {port}...")
-                
-                try:
-                    # 连接Chrome实例
-                    if self.chrome_automation.connect_to_chrome(port):
-                        self.log_message.emit(f"成功连接到Chrome实例 {port}")
-                        
-                        # 执行具体的自动化操作
-                        result = self.perform_automation_tasks(port)
-                        self.task_results.append(result)
-                        
-                        # 更新进度
-                        progress = 20 + (i + 1) * 60 // len(chrome_instances)
-                        self.progress_updated.emit(progress)
-                        
-                    else:
-                        self.log_message.emit(f"无法连接到Chrome实例 {port}", level="warning")
-                        
-                except Exception as e:
-                    self.log_message.emit(f"处理Chrome实例 {port} 时出错: {str(e)}", level="error")
-                    continue
+            # 步骤2: 为每个实例准备独立的Chrome自动化（预先计算每个实例完成后的进度）
+            self._emit_progress(20)
+            n = len(chrome_instances)
+            progress_schedule = [20 + (i + 1) * 60 // n for i in range(n)]
+            
+            # 步骤3: 并发执行各实例的自动化任务
+            with ThreadPoolExecutor(max_workers=n) as executor:
+                futures = {
+                    executor.submit(self._process_instance, port): port
+                    for port in chrome_instances
+                }
+                for done, future in enumerate(as_completed(futures)):
+                    port = futures[future]
+                    try:
+                        result = future.result()
+                        if result is not None:
+                            self.task_results.append(result)
+                    except Exception as e:
+                        self._queue_log(f"处理Chrome实例 {port} 时出错: {str(e)}", level="error")
+                    
+                    # 更新进度
+                    self._emit_progress(progress_schedule[done])
             
             # 步骤4: 生成报告
-            self.progress_updated.emit(90)
-            self.log_message.emit("正在生成任务报告...")
+            self._emit_progress(90)
+            self._queue_log("正在生成任务报告...")
             report = self.generate_report()
             
             # 步骤5: 清理资源
-            self.progress_updated.emit(100)
+            self._emit_progress(100)
             self.cleanup()
             
             # 发送完成信号
@@ -91,11 +169,11 @@ class BrowserAutomationTask(QThread):
             message = f"任务完成！处理了 {len(self.task_results)} 个Chrome实例"
             self.task_finished.emit(success, message)
             
-            self.log_message.emit(message)
+            self._queue_log(message)
             
         except Exception as e:
             error_msg = f"浏览器自动化任务执行失败: {str(e)}"
-            self.log_message.emit(error_msg, level="error")
+            self._queue_log(error_msg, level="error")
             self.task_finished.emit(False, error_msg)
             self.cleanup()
             
@@ -105,106 +183,116 @@ class BrowserAutomationTask(QThread):
     def detect_chrome_instances(self) -> List[int]:
         """检测可用的Chrome实例"""
         try:
-            # 使用netstat检测端口
-            import psutil
-            chrome_ports = []
-            
-            for conn in psutil.net_connections():
-                if conn.status == 'LISTEN':
-                    port = conn.laddr.port
-                    if 9222 <= port <= 9232:  # Chrome调试端口范围
-                        chrome_ports.append(port)
-            
-            # 去重并排序
-            chrome_ports = sorted(list(set(chrome_ports)))
+            # 直接探测Chrome调试端口范围，无需枚举系统中所有TCP连接
+            with ThreadPoolExecutor(max_workers=len(CHROME_DEBUG_PORTS)) as executor:
+                probes = executor.map(_is_port_listening, CHROME_DEBUG_PORTS)
+                chrome_ports = [port for port, listening in zip(CHROME_DEBUG_PORTS, probes) if listening]
             
             if not chrome_ports:
                 # 尝试默认端口
                 chrome_ports = [9222]
             
-            self.log_message.emit(f"检测到 {len(chrome_ports)} 个Chrome实例: {chrome_ports}")
+            self._queue_log(f"检测到 {len(chrome_ports)} 个Chrome实例: {chrome_ports}")
             return chrome_ports
             
         except Exception as e:
-            self.log_message.emit(f"检测Chrome实例失败: {str(e)}", level="warning")
+            self._queue_log(f"检测Chrome实例失败: {str(e)}", level="warning")
             return [9222]  # 返回默认端口
     
-    def perform_automation_tasks(self, port: int) -> Dict:
+    def _process_instance(self, port: int) -> Optional[PortResult]:
+        """
+        使用独立的ChromeAutomation处理单个Chrome实例
+        
+        Args:
+            port: Chrome调试端口
+            
+        Returns:
+            PortResult: 任务结果，未连接或任务已停止时返回None
+        """
+        if not self.is_running:
+            return None
+        
+        self._queue_log(f"正在处理Chrome实例 {port}...")
+        chrome_automation = ChromeAutomation()
+        with self._automations_lock:
+            self._automations.add(chrome_automation)
+        
+        try:
+            if not chrome_automation.connect_to_chrome(port):
+                self._queue_log(f"无法连接到Chrome实例 {port}", level="warning")
+                return None
+            
+            self._queue_log(f"成功连接到Chrome实例 {port}")
+            return self.perform_automation_tasks(chrome_automation, port)
+            
+        finally:
+            chrome_automation.close()
+            with self._automations_lock:
+                self._automations.discard(chrome_automation)
+    
+    def perform_automation_tasks(self, chrome_automation: ChromeAutomation, port: int) -> PortResult:
         """执行具体的自动化操作"""
-        result = {
-            'port': port,
-            'start_time': datetime.now().isoformat(),
-            'status': 'success',
-            'actions': [],
-            'screenshots': [],
-            'error': None
-        }
+        result = PortResult(port=port, start_time=datetime.now().isoformat())
         
         try:
             # 任务1: 打开百度并搜索
-            self.log_message.emit(f"在端口 {port} 上执行百度搜索任务...")
+            self._queue_log(f"在端口 {port} 上执行百度搜索任务...")
             
             # 导航到百度
-            self.chrome_automation.navigate_to_url("https://www.baidu.com")
+            chrome_automation.navigate_to_url("https://www.baidu.com")
             time.sleep(2)
             
             # 搜索关键词
             search_query = "浏览器自动化测试"
-            self.chrome_automation.perform_search(search_query)
+            chrome_automation.perform_search(search_query)
             time.sleep(3)
             
             # 截图保存
-            screenshot_path = self.take_screenshot(port, "baidu_search")
-            result['screenshots'].append(screenshot_path)
+            screenshot_path = self.take_screenshot(chrome_automation, port, "baidu_search")
+            result.screenshots.append(screenshot_path)
             
-            result['actions'].append({
+            result.actions.append({
                 'action': 'baidu_search',
                 'query': search_query,
                 'screenshot': screenshot_path
             })
             
             # 任务2: 滚动页面
-            self.log_message.emit(f"在端口 {port} 上执行页面滚动...")
-            self.chrome_automation.scroll_page()
+            self._queue_log(f"在端口 {port} 上执行页面滚动...")
+            chrome_automation.scroll_page()
             time.sleep(1)
             
             # 任务3: 获取页面信息
-            page_info = self.chrome_automation.get_page_info()
-            result['page_info'] = page_info
+            page_info = chrome_automation.get_page_info()
+            result.page_info = page_info
             
-            self.log_message.emit(f"端口 {port} 的自动化任务执行完成")
+            self._queue_log(f"端口 {port} 的自动化任务执行完成")
             
         except Exception as e:
-            result['status'] = 'failed'
-            result['error'] = str(e)
-            self.log_message.emit(f"端口 {port} 的自动化任务失败: {str(e)}", level="error")
+            result.status = 'failed'
+            result.error = str(e)
+            self._queue_log(f"端口 {port} 的自动化任务失败: {str(e)}", level="error")
             
         finally:
-            result['end_time'] = datetime.now().isoformat()
+            result.end_time = datetime.now().isoformat()
             
         return result
     
-    def take_screenshot(self, port: int, action_name: str) -> str:
+    def take_screenshot(self, chrome_automation: ChromeAutomation, port: int, action_name: str) -> str:
         """截图并保存"""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"screenshot_{port}_{action_name}_{timestamp}.png"
+            filename = f"screenshot_{port}_{action_name}_{time.time_ns()}.jpg"
+            screenshot_path = os.path.join(self._screenshot_dir, filename)
             
-            # 确保截图目录存在
-            screenshot_dir = os.path.join(project_root, "screenshots")
-            os.makedirs(screenshot_dir, exist_ok=True)
-            
-            screenshot_path = os.path.join(screenshot_dir, filename)
-            
-            if self.chrome_automation.take_screenshot(screenshot_path):
-                self.log_message.emit(f"截图已保存: {screenshot_path}")
+            if chrome_automation.take_screenshot(screenshot_path):
+                self._queue_log(f"截图已保存: {screenshot_path}")
                 return screenshot_path
             else:
-                self.log_message.emit("截图失败", level="warning")
+                self._queue_log("截图失败", level="warning")
                 return ""
                 
         except Exception as e:
-            self.log_message.emit(f"截图出错: {str(e)}", level="error")
+            self._queue_log(f"截图出错: {str(e)}", level="error")
             return ""
     
     def generate_report(self) -> str:
@@ -213,44 +301,46 @@ class BrowserAutomationTask(QThread):
             report = {
                 'task_summary': {
                     'total_instances': len(self.task_results),
-                    'successful_instances': len([r for r in self.task_results if r['status'] == 'success']),
-                    'failed_instances': len([r for r in self.task_results if r['status'] == 'failed']),
+                    'successful_instances': len([r for r in self.task_results if r.status == 'success']),
+                    'failed_instances': len([r for r in self.task_results if r.status == 'failed']),
                     'start_time': datetime.now().isoformat()
                 },
-                'detailed_results': self.task_results
+                'detailed_results': [asdict(r) for r in self.task_results]
             }
             
             # 保存报告到文件
-            report_dir = os.path.join(project_root, "reports")
-            os.makedirs(report_dir, exist_ok=True)
-            
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            report_path = os.path.join(report_dir, f"automation_report_{timestamp}.json")
+            report_path = os.path.join(self._report_dir, f"automation_report_{timestamp}.json")
             
-            with open(report_path, 'w', encoding='utf-8') as f:
-                json.dump(report, f, ensure_ascii=False, indent=2)
+            dump_json(report, report_path)
             
-            self.log_message.emit(f"任务报告已保存: {report_path}")
+            self._queue_log(f"任务报告已保存: {report_path}")
             return report_path
             
         except Exception as e:
-            self.log_message.emit(f"生成报告失败: {str(e)}", level="error")
+            self._queue_log(f"生成报告失败: {str(e)}", level="error")
             return ""
     
     def cleanup(self):
         """清理资源"""
         try:
-            if self.chrome_automation:
-                self.chrome_automation.close()
-                self.chrome_automation = None
+            # 各实例在任务结束时自行关闭，这里关闭尚未结束的实例
+            with self._automations_lock:
+                automations = list(self._automations)
+                self._automations.clear()
+            
+            for chrome_automation in automations:
+                chrome_automation.close()
                 
-            self.log_message.emit("资源清理完成")
+            self._queue_log("资源清理完成")
             
         except Exception as e:
-            self.log_message.emit(f"清理资源时出错: {str(e)}", level="warning")
+            self._queue_log(f"清理资源时出错: {str(e)}", level="warning")
     
     def stop(self):
         """停止任务"""
         self.is_running = False
         self.cleanup()
-        self.log_message.emit("任务已停止")
\ No newline at end of file
+        self._queue_log("任务已停止")
+        # 线程结束时定时器可能已停止，立即发送，避免停止消息留在缓冲中
+        self._flush_log_buffer()
\ No newline at end of file
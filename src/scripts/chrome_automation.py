@@ -1,18 +1,22 @@
 import os
+import re
 import sys
-import json
 import time
+import asyncio
+import shutil
+import atexit
+import functools
 import logging
+import threading
 import subprocess
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Literal, Set, Union
 from datetime import datetime
 
-# 添加项目根目录到Python路径
-project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-sys.path.insert(0, project_root)
+from src._paths import PROJECT_ROOT
+from src.config.app_config import app_config
 
 try:
-    from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page
+    from playwright.async_api import async_playwright, Browser, Page
     HAS_PLAYWRIGHT = True
 except ImportError:
     HAS_PLAYWRIGHT = False
@@ -21,27 +25,331 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+class _LoopThread:
+    """
+    在守护线程中运行的asyncio事件循环
+    
+    所有Playwright调用都在该循环上执行，任意线程都可以通过run()同步等待结果
+    """
+    
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_forever, name="playwright-loop", daemon=True)
+        self._thread.start()
+    
+    def _run_forever(self) -> None:
+        """事件循环线程入口"""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+    
+    def run(self, coro, timeout: Optional[float] = None):
+        """
+        在事件循环线程上执行协程并等待结果
+        
+        Args:
+            coro: 要执行的协程
+            timeout: 等待超时时间（秒），None表示一直等待
+            
+        Returns:
+            协程的返回值
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+
+# 全局Playwright事件循环
+_LOOP = _LoopThread()
+
+
+class _ChromePool:
+    """
+    进程级浏览器连接池
+    
+    常驻Playwright驱动并按调试端口缓存已连接的Browser，ChromeAutomation实例只创建和关闭自己的页面。
+    所有方法都在事件循环线程上执行。
+    """
+    
+    def __init__(self):
+        self._playwright = None
+        self._browsers: Dict[int, "Browser"] = {}
+        self._lock = asyncio.Lock()
+    
+    async def get_playwright(self):
+        """获取常驻的Playwright驱动"""
+        async with self._lock:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            return self._playwright
+    
+    async def get_browser(self, port: int) -> "Browser":
+        """
+        获取连接到指定调试端口的浏览器，已断开时重新连接
+        
+        Args:
+            port: 调试端口号
+            
+        Returns:
+            Browser: 已连接的浏览器
+        """
+        playwright = await self.get_playwright()
+        async with self._lock:
+            browser = self._browsers.get(port)
+            if browser is None or not browser.is_connected():
+                browser = await playwright.chromium.connect_over_cdp(
+                    f"http://localhost:{port}"
+                )
+                self._browsers[port] = browser
+            return browser
+    
+    async def discard(self, port: int) -> None:
+        """
+        丢弃指定端口的浏览器连接（对应的Chrome进程已结束）
+        
+        Args:
+            port: 调试端口号
+        """
+        async with self._lock:
+            self._browsers.pop(port, None)
+    
+    async def _shutdown(self) -> None:
+        """断开所有浏览器连接并停止Playwright驱动"""
+        async with self._lock:
+            browsers = list(self._browsers.values())
+            self._browsers.clear()
+            playwright, self._playwright = self._playwright, None
+        
+        try:
+            for browser in browsers:
+                await browser.close()
+            if playwright is not None:
+                await playwright.stop()
+        except Exception as e:
+            logger.error("释放浏览器连接失败: %s", e)
+    
+    def shutdown(self) -> None:
+        """断开所有浏览器连接并停止Playwright驱动"""
+        try:
+            _LOOP.run(self._shutdown(), timeout=10)
+        except Exception as e:
+            logger.error("释放浏览器连接失败: %s", e)
+
+
+# 新建上下文的默认视口大小
+_DEFAULT_VIEWPORT = {'width': 1920, 'height': 1080}
+
+# Chrome启动参数（取自chrome-launcher的默认参数集），关闭后台联网、同步、组件更新等非必要开销
+DEFAULT_FLAGS = (
+    "--disable-features=Translate,OptimizationHints,MediaRouter,DialMediaRouteProvider,"
+    "CalculateNativeWinOcclusion,InterestFeedContentSuggestions,"
+    "CertificateTransparencyComponentUpdater,AutofillServerCommunication,PrivacySandboxSettings4",
+    "--disable-component-extensions-with-background-pages",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-client-side-phishing-detection",
+    "--disable-sync",
+    "--metrics-recording-only",
+    "--disable-default-apps",
+    "--mute-audio",
+    "--no-default-browser-check",
+    "--no-first-run",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--disable-background-timer-throttling",
+    "--disable-ipc-flooding-protection",
+    "--password-store=basic",
+    "--use-mock-keychain",
+    "--force-fieldtrials=*BackgroundTracing/default/",
+    "--disable-hang-monitor",
+    "--disable-prompt-on-repost",
+    "--disable-domain-reliability",
+    "--propagate-iph-for-testing",
+    # 自动化场景附加参数
+    "--disable-extensions",
+    "--disable-popup-blocking",
+    "--enable-automation",
+)
+
+# 无头模式附加参数（无显示输出时不需要GPU合成）
+HEADLESS_FLAGS = (
+    "--headless=new",
+    "--disable-gpu",
+)
+
+# 开启资源拦截时默认屏蔽的资源类型
+DEFAULT_BLOCKED_RESOURCES = frozenset({"image", "media", "font", "stylesheet"})
+
+# 各平台Chrome可执行文件的常见安装路径，按sys.platform取值，只检查当前平台的路径
+_CHROME_PATHS = {
+    "win32": (
+        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+        os.path.expanduser(r"~\AppData\Local\Google\Chrome\Application\chrome.exe"),
+    ),
+    "darwin": (
+        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    ),
+    "linux": (
+        "/usr/bin/google-chrome",
+        "/usr/bin/google-chrome-stable",
+        "/usr/bin/chromium-browser",
+        "/snap/bin/chromium",
+    ),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _locate_chrome() -> Optional[str]:
+    """
+    查找Chrome可执行文件路径，结果在进程内缓存
+    
+    Returns:
+        str: Chrome可执行文件路径，找不到返回None
+    """
+    for path in _CHROME_PATHS.get(sys.platform, ()):
+        if os.path.exists(path):
+            return path
+    
+    # 尝试从PATH查找
+    return shutil.which("chrome") or shutil.which("google-chrome") or shutil.which("chromium")
+
+
+# 截图文件扩展名对应的图片格式
+_SCREENSHOT_FORMATS = {
+    ".png": "png",
+    ".jpg": "jpeg",
+    ".jpeg": "jpeg",
+}
+
+
+def _screenshot_dir() -> str:
+    """
+    获取配置的截图目录（与任务截图共用同一目录，创建目录的结果由配置模块缓存）
+    
+    Returns:
+        str: 截图目录路径
+    """
+    return app_config.get_path('screenshots')
+
+
+# Chrome调试端点就绪时输出到stderr的提示行
+_DEVTOOLS_BANNER = re.compile(r"DevTools listening on ws://")
+
+# 等待调试端点就绪的最长时间（秒）
+_DEVTOOLS_TIMEOUT = 15.0
+
+
+def _watch_devtools_banner(proc: subprocess.Popen) -> threading.Event:
+    """
+    在后台线程读取Chrome的stderr，出现DevTools监听提示或输出结束时置位事件
+    
+    读取线程会一直读到stderr结束，避免管道写满阻塞Chrome
+    
+    Args:
+        proc: 以stderr=PIPE启动的Chrome进程
+        
+    Returns:
+        threading.Event: 就绪事件
+    """
+    ready = threading.Event()
+    
+    def _reader():
+        try:
+            for line in proc.stderr:
+                if not ready.is_set() and _DEVTOOLS_BANNER.search(line):
+                    ready.set()
+        except Exception as e:
+            logger.warning("读取Chrome输出失败: %s", e)
+        finally:
+            # 进程退出（如交给已运行的实例处理）或读取出错时不再等待，由后续连接判断成败
+            ready.set()
+    
+    threading.Thread(target=_reader, name="chrome-stderr", daemon=True).start()
+    return ready
+
+
+# 本进程启动且尚未结束的Chrome进程
+_spawned_procs: Set[subprocess.Popen] = set()
+
+
+def _terminate_process(proc: subprocess.Popen, timeout: float = 5.0) -> None:
+    """
+    结束Chrome进程，超时未退出时强制结束
+    
+    Args:
+        proc: Chrome进程
+        timeout: 等待进程退出的时间（秒）
+    """
+    _spawned_procs.discard(proc)
+    if proc.poll() is not None:
+        return
+    
+    proc.terminate()
+    try:
+        proc.wait(timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def _terminate_spawned() -> None:
+    """退出时结束所有未关闭的Chrome进程，避免残留进程占用用户数据目录"""
+    for proc in list(_spawned_procs):
+        _terminate_process(proc)
+
+
+# 先注册的后执行：连接池断开连接之后再结束Chrome进程
+atexit.register(_terminate_spawned)
+
+# 全局浏览器连接池
+chrome_pool = _ChromePool()
+atexit.register(chrome_pool.shutdown)
+
+
 class ChromeAutomation:
     """Chrome浏览器自动化类"""
     
-    def __init__(self):
+    def __init__(self, browser: Optional["Browser"] = None,
+                 block_resources: Union[bool, Set[str], None] = None,
+                 storage_path: Optional[str] = None):
+        """
+        Args:
+            browser: 共享的浏览器连接，为None时从连接池按端口获取
+            block_resources: 需要拦截的资源类型，传True时使用DEFAULT_BLOCKED_RESOURCES
+            storage_path: Cookie等存储状态的保存路径，创建上下文时加载，关闭时写回
+        """
         self.playwright = None
-        self.browser = None
+        self.browser = browser
         self.context = None
         self.page = None
         self.is_connected = False
+        self._shared_browser = browser
+        self.storage_path = storage_path
+        self._proc: Optional[subprocess.Popen] = None
+        self._port: Optional[int] = None
+        
+        if block_resources is True:
+            block_resources = DEFAULT_BLOCKED_RESOURCES
+        self.block_resources = frozenset(block_resources or ())
+        
+        # 每执行一定次数的导航/搜索后重建上下文，释放Playwright累积的请求/响应对象
+        self.ctx_refresh_every = 50
+        self._ops_since_ctx_reset = 0
         
-    def start_chrome_with_debug_port(self, port: int = 9222, user_data_dir: str = None) -> bool:
+    def start_chrome_with_debug_port(self, port: int = 9222, user_data_dir: str = None,
+                                     headless: bool = False) -> bool:
         """
         启动Chrome浏览器并开启调试端口
         
         Args:
             port: 调试端口号，默认9222
             user_data_dir: Chrome用户数据目录
+            headless: 是否以无头模式启动
             
         Returns:
             bool: 启动是否成功
         """
+        # 已有Chrome在该端口运行时直接复用（探测失败属于正常情况，不记录错误）
+        if self.connect_to_chrome(port, quiet=True):
+            return True
+        
         try:
             # 构建Chrome启动命令
             chrome_path = self._find_chrome_executable()
@@ -51,7 +359,7 @@ class ChromeAutomation:
             
             # 设置用户数据目录
             if not user_data_dir:
-                user_data_dir = os.path.join(project_root, "Chrome_UserData")
+                user_data_dir = os.path.join(PROJECT_ROOT, "Chrome_UserData")
             
             # 确保目录存在
             os.makedirs(user_data_dir, exist_ok=True)
@@ -61,86 +369,158 @@ class ChromeAutomation:
                 chrome_path,
                 f"--remote-debugging-port={port}",
                 f"--user-data-dir={user_data_dir}",
-                "--no-first-run",
-                "--no-default-browser-check",
-                "--disable-extensions",
-                "--disable-popup-blocking",
-                "--disable-background-timer-throttling",
-                "--disable-renderer-backgrounding",
-                "--disable-backgrounding-occluded-windows",
-                "--disable-features=TranslateUI",
-                "--disable-ipc-flooding-protection",
-                "--enable-automation",
-                "--password-store=basic",
-                "--use-mock-keychain",
+                *DEFAULT_FLAGS,
+                *(HEADLESS_FLAGS if headless else ()),
                 "about:blank"
             ]
             
             # 启动Chrome进程
-            logger.info(f"启动Chrome: {' '.join(cmd)}")
-            subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            logger.info("启动Chrome: %s", cmd)
+            self._proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                # Chrome按UTF-8输出，不依赖系统区域编码（如GBK），无法解码的字节替换掉
+                encoding="utf-8",
+                errors="replace"
+            )
+            self._port = port
+            _spawned_procs.add(self._proc)
             
-            # 等待Chrome启动
-            time.sleep(3)
+            # 等待Chrome在stderr输出调试端点就绪提示
+            if not _watch_devtools_banner(self._proc).wait(_DEVTOOLS_TIMEOUT):
+                logger.error("等待Chrome调试端口就绪超时 (端口: %s)", port)
+                self._terminate_chrome()
+                return False
             
             # 测试连接
             return self.connect_to_chrome(port)
             
         except Exception as e:
-            logger.error(f"启动Chrome失败: {str(e)}")
+            logger.error("启动Chrome失败: %s", e)
             return False
     
-    def connect_to_chrome(self, port: int = 9222) -> bool:
+    def connect_to_chrome(self, port: int = 9222, quiet: bool = False) -> bool:
         """
         连接到已启动的Chrome实例
         
         Args:
             port: 调试端口号
+            quiet: 连接失败时只记录调试日志（用于探测端口上是否已有Chrome）
             
         Returns:
             bool: 连接是否成功
         """
+        return _LOOP.run(self._connect_to_chrome(port, quiet))
+    
+    async def _connect_to_chrome(self, port: int, quiet: bool = False) -> bool:
+        """connect_to_chrome的异步实现"""
+        fail_log = logger.debug if quiet else logger.error
+        
         if not HAS_PLAYWRIGHT:
-            logger.error("Playwright未安装，无法连接Chrome")
+            fail_log("Playwright未安装，无法连接Chrome")
             return False
             
         try:
-            # 关闭之前的连接
-            self.close()
-            
-            # 启动Playwright
-            self.playwright = sync_playwright().start()
-            
-            # 连接到Chrome
-            self.browser = self.playwright.chromium.connect_over_cdp(
-                f"http://localhost:{port}"
-            )
-            
-            # 获取第一个上下文，如果没有则创建
-            contexts = self.browser.contexts
-            if contexts:
-                self.context = contexts[0]
-            else:
-                self.context = self.browser.new_context(
-                    viewport={'width': 1920, 'height': 1080}
-                )
+            # 关闭之前的上下文
+            await self._close()
             
-            # 获取或创建页面
-            pages = self.context.pages
-            if pages:
-                self.page = pages[0]
+            # 优先使用共享的浏览器，否则从连接池获取常驻的浏览器连接
+            self.playwright = await chrome_pool.get_playwright()
+            if self._shared_browser is not None:
+                self.browser = self._shared_browser
             else:
-                self.page = self.context.new_page()
+                self.browser = await chrome_pool.get_browser(port)
             
-            self.is_connected = True
-            logger.info(f"成功连接到Chrome实例 (端口: {port})")
+            await self._acquire_context()
+            logger.info("成功连接到Chrome实例 (端口: %s)", port)
             return True
             
         except Exception as e:
-            logger.error(f"连接Chrome失败: {str(e)}")
-            self.close()
+            fail_log("连接Chrome失败: %s", e)
+            await self._close()
             return False
     
+    def acquire_context(self) -> bool:
+        """
+        在当前浏览器上创建本实例独占的上下文和页面
+        
+        Returns:
+            bool: 是否创建成功
+        """
+        try:
+            _LOOP.run(self._acquire_context())
+            return True
+        except Exception as e:
+            logger.error("创建浏览器上下文失败: %s", e)
+            return False
+    
+    async def _acquire_context(self) -> None:
+        """acquire_context的异步实现"""
+        if self.browser is None:
+            raise RuntimeError("未连接到浏览器")
+        
+        if self.context is not None:
+            await self.context.close()
+        
+        # 加载上次保存的存储状态，跳过登录等预热流程
+        storage_state = None
+        if self.storage_path and os.path.exists(self.storage_path):
+            storage_state = self.storage_path
+        
+        self.context = await self.browser.new_context(
+            viewport=_DEFAULT_VIEWPORT,
+            storage_state=storage_state
+        )
+        self.page = await self._attach_page(await self.context.new_page())
+        self._ops_since_ctx_reset = 0
+        self.is_connected = True
+    
+    async def _attach_page(self, page: "Page") -> "Page":
+        """
+        为新建的页面安装资源拦截
+        
+        Args:
+            page: 新建的页面
+            
+        Returns:
+            Page: 传入的页面
+        """
+        if self.block_resources:
+            await page.route("**/*", self._route_request)
+        return page
+    
+    async def _route_request(self, route) -> None:
+        """拦截屏蔽类型的资源请求，其余请求正常放行"""
+        if route.request.resource_type in self.block_resources:
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    @classmethod
+    def open_many(cls, n: int, port: int = 9222, **kwargs) -> List["ChromeAutomation"]:
+        """
+        创建共享同一浏览器连接的多个实例，每个实例拥有独立的上下文
+        
+        Args:
+            n: 实例数量
+            port: 调试端口号
+            **kwargs: 传给构造函数的其他参数（如block_resources）
+            
+        Returns:
+            list: 已连接的实例列表
+        """
+        browser = _LOOP.run(chrome_pool.get_browser(port))
+        instances = []
+        for _ in range(n):
+            instance = cls(browser=browser, **kwargs)
+            if not instance.connect_to_chrome(port):
+                for opened in instances:
+                    opened.close()
+                raise RuntimeError(f"创建浏览器上下文失败 (端口: {port})")
+            instances.append(instance)
+        return instances
+    
     def navigate_to_url(self, url: str, timeout: int = 30) -> bool:
         """
         导航到指定URL
@@ -152,52 +532,77 @@ class ChromeAutomation:
         Returns:
             bool: 导航是否成功
         """
+        return _LOOP.run(self._navigate_to_url(url, timeout))
+    
+    async def _navigate_to_url(self, url: str, timeout: int) -> bool:
+        """navigate_to_url的异步实现"""
         if not self.is_connected or not self.page:
             logger.error("未连接到Chrome")
             return False
             
         try:
-            logger.info(f"导航到: {url}")
-            self.page.goto(url, timeout=timeout * 1000)
+            # 导航前页面内容会被替换，在此时机重建上下文不影响调用方
+            self._ops_since_ctx_reset += 1
+            if self._ops_since_ctx_reset >= self.ctx_refresh_every:
+                try:
+                    await self._rotate_context()
+                except Exception as e:
+                    # 重建失败时继续使用当前上下文，下一轮计数后再尝试
+                    logger.error("重建浏览器上下文失败: %s", e)
+                    self._ops_since_ctx_reset = 0
+            
+            logger.info("导航到: %s", url)
+            await self.page.goto(url, timeout=timeout * 1000)
             return True
             
         except Exception as e:
-            logger.error(f"导航失败: {str(e)}")
+            logger.error("导航失败: %s", e)
             return False
     
-    def perform_search(self, query: str, selector: str = "input[name='wd']") -> bool:
+    def perform_search(self, query: str, selector: str = "input[name='wd']",
+                       result_selector: Optional[str] = None, timeout: int = 10) -> bool:
         """
         执行搜索操作
         
         Args:
             query: 搜索关键词
             selector: 搜索框选择器
+            result_selector: 搜索结果选择器，提供时等待其出现
+            timeout: 等待搜索结果的超时时间（秒）
             
         Returns:
             bool: 搜索是否成功
         """
+        return _LOOP.run(self._perform_search(query, selector, result_selector, timeout))
+    
+    async def _perform_search(self, query: str, selector: str,
+                              result_selector: Optional[str], timeout: int) -> bool:
+        """perform_search的异步实现"""
         if not self.page:
             logger.error("页面未初始化")
             return False
             
         try:
-            # 等待搜索框出现
-            self.page.wait_for_selector(selector, timeout=5000)
+            self._ops_since_ctx_reset += 1
+            
+            search_box = self.page.locator(selector)
             
-            # 输入搜索词
-            self.page.fill(selector, query)
+            # 等待搜索框可用并输入搜索词
+            await search_box.fill(query, timeout=5000)
             
             # 按回车键搜索
-            self.page.press(selector, "Enter")
+            await search_box.press("Enter")
             
-            # 等待页面加载
-            self.page.wait_for_load_state("networkidle")
+            # 等待页面DOM加载完成（networkidle在有长轮询或广告的页面上可能迟迟不触发）
+            await self.page.wait_for_load_state("domcontentloaded")
+            if result_selector:
+                await self.page.wait_for_selector(result_selector, timeout=timeout * 1000)
             
-            logger.info(f"搜索完成: {query}")
+            logger.info("搜索完成: %s", query)
             return True
             
         except Exception as e:
-            logger.error(f"搜索失败: {str(e)}")
+            logger.error("搜索失败: %s", e)
             return False
     
     def scroll_page(self, direction: str = "down", pixels: int = 500) -> bool:
@@ -211,6 +616,10 @@ class ChromeAutomation:
         Returns:
             bool: 滚动是否成功
         """
+        return _LOOP.run(self._scroll_page(direction, pixels))
+    
+    async def _scroll_page(self, direction: str, pixels: int) -> bool:
+        """scroll_page的异步实现"""
         if not self.page:
             return False
             
@@ -223,13 +632,14 @@ class ChromeAutomation:
             }
             
             x, y = scroll_map.get(direction, (0, pixels))
-            self.page.evaluate(f"window.scrollBy({x}, {y})")
+            # 直接派发滚轮事件，无需在页面内解析执行脚本
+            await self.page.mouse.wheel(x, y)
             
-            logger.info(f"页面滚动: {direction} {pixels}px")
+            logger.info("页面滚动: %s %spx", direction, pixels)
             return True
             
         except Exception as e:
-            logger.error(f"滚动失败: {str(e)}")
+            logger.error("滚动失败: %s", e)
             return False
     
     def click_element(self, selector: str, timeout: int = 5) -> bool:
@@ -243,17 +653,21 @@ class ChromeAutomation:
         Returns:
             bool: 点击是否成功
         """
+        return _LOOP.run(self._click_element(selector, timeout))
+    
+    async def _click_element(self, selector: str, timeout: int) -> bool:
+        """click_element的异步实现"""
         if not self.page:
             return False
             
         try:
-            self.page.wait_for_selector(selector, timeout=timeout * 1000)
-            self.page.click(selector)
-            logger.info(f"点击元素: {selector}")
+            # locator.click在一次调用内完成可见性等待与点击，失败时自动重试
+            await self.page.locator(selector).click(timeout=timeout * 1000)
+            logger.info("点击元素: %s", selector)
             return True
             
         except Exception as e:
-            logger.error(f"点击失败: {str(e)}")
+            logger.error("点击失败: %s", e)
             return False
     
     def get_element_text(self, selector: str) -> Optional[str]:
@@ -266,17 +680,25 @@ class ChromeAutomation:
         Returns:
             str: 元素文本，失败返回None
         """
+        return _LOOP.run(self._get_element_text(selector))
+    
+    async def _get_element_text(self, selector: str) -> Optional[str]:
+        """get_element_text的异步实现"""
         if not self.page:
             return None
             
         try:
-            element = self.page.query_selector(selector)
-            if element:
-                return element.text_content()
-            return None
+            handle = await self.page.query_selector(selector)
+            if not handle:
+                return None
+            try:
+                return await handle.text_content()
+            finally:
+                # 及时释放句柄，避免页面端对象一直被引用
+                await handle.dispose()
             
         except Exception as e:
-            logger.error(f"获取元素文本失败: {str(e)}")
+            logger.error("获取元素文本失败: %s", e)
             return None
     
     def get_page_info(self) -> Dict[str, Any]:
@@ -286,55 +708,78 @@ class ChromeAutomation:
         Returns:
             dict: 页面信息
         """
+        return _LOOP.run(self._get_page_info())
+    
+    async def _get_page_info(self) -> Dict[str, Any]:
+        """get_page_info的异步实现"""
         if not self.page:
             return {}
             
         try:
+            # 一次调用获取全部页面信息
+            info = await self.page.evaluate("""() => ({
+                url: location.href,
+                title: document.title,
+                width: window.innerWidth,
+                height: window.innerHeight
+            })""")
             return {
-                'url': self.page.url,
-                'title': self.page.title(),
+                'url': info['url'],
+                'title': info['title'],
                 'viewport': {
-                    'width': self.page.viewport_size['width'],
-                    'height': self.page.viewport_size['height']
+                    'width': info['width'],
+                    'height': info['height']
                 },
                 'timestamp': datetime.now().isoformat()
             }
             
         except Exception as e:
-            logger.error(f"获取页面信息失败: {str(e)}")
+            logger.error("获取页面信息失败: %s", e)
             return {}
     
-    def take_screenshot(self, filename: str = None, full_page: bool = True) -> Optional[str]:
+    def take_screenshot(self, filename: str = None, full_page: bool = True,
+                        fmt: Literal["png", "jpeg"] = "jpeg", quality: int = 70) -> Optional[str]:
         """
         截图
         
         Args:
-            filename: 文件名，如果为None则自动生成
+            filename: 文件名，如果为None则自动生成；指定时按扩展名确定图片格式
             full_page: 是否截取整个页面
+            fmt: 自动生成文件名时的图片格式，默认jpeg（体积小、编码快），需要无损图像时传png
+            quality: jpeg压缩质量（0-100），png格式时忽略
             
         Returns:
             str: 截图文件路径，失败返回None
         """
+        return _LOOP.run(self._take_screenshot(filename, full_page, fmt, quality))
+    
+    async def _take_screenshot(self, filename: Optional[str], full_page: bool,
+                               fmt: str, quality: int) -> Optional[str]:
+        """take_screenshot的异步实现"""
         if not self.page:
             return None
             
         try:
-            if not filename:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"screenshot_{timestamp}.png"
-            
-            # 确保截图目录存在
-            screenshot_dir = os.path.join(project_root, "screenshots")
-            os.makedirs(screenshot_dir, exist_ok=True)
+            if filename:
+                # 文件名已指定时按扩展名确定格式，避免扩展名与内容不符
+                ext = os.path.splitext(filename)[1].lower()
+                fmt = _SCREENSHOT_FORMATS.get(ext, fmt)
+            else:
+                # 纳秒时间戳避免同一秒内多次截图互相覆盖
+                ext = "jpg" if fmt == "jpeg" else "png"
+                filename = f"screenshot_{time.time_ns()}.{ext}"
             
-            filepath = os.path.join(screenshot_dir, filename)
+            filepath = os.path.join(_screenshot_dir(), filename)
             
-            self.page.screenshot(path=filepath, full_page=full_page)
-            logger.info(f"截图已保存: {filepath}")
+            options = {'path': filepath, 'full_page': full_page, 'type': fmt}
+            if fmt == "jpeg":
+                options['quality'] = quality
+            await self.page.screenshot(**options)
+            logger.info("截图已保存: %s", filepath)
             return filepath
             
         except Exception as e:
-            logger.error(f"截图失败: {str(e)}")
+            logger.error("截图失败: %s", e)
             return None
     
     def wait_for_selector(self, selector: str, timeout: int = 10) -> bool:
@@ -348,15 +793,19 @@ class ChromeAutomation:
         Returns:
             bool: 元素是否出现
         """
+        return _LOOP.run(self._wait_for_selector(selector, timeout))
+    
+    async def _wait_for_selector(self, selector: str, timeout: int) -> bool:
+        """wait_for_selector的异步实现"""
         if not self.page:
             return False
             
         try:
-            self.page.wait_for_selector(selector, timeout=timeout * 1000)
+            await self.page.wait_for_selector(selector, timeout=timeout * 1000)
             return True
             
         except Exception as e:
-            logger.error(f"等待元素超时: {str(e)}")
+            logger.error("等待元素超时: %s", e)
             return False
     
     def get_all_links(self) -> List[Dict[str, str]]:
@@ -366,47 +815,111 @@ class ChromeAutomation:
         Returns:
             list: 链接列表，每个元素包含text和href
         """
+        return _LOOP.run(self._get_all_links())
+    
+    async def _get_all_links(self) -> List[Dict[str, str]]:
+        """get_all_links的异步实现"""
         if not self.page:
             return []
             
         try:
-            links = self.page.query_selector_all('a[href]')
-            return [
-                {
-                    'text': link.text_content().strip(),
-                    'href': link.get_attribute('href')
-                }
-                for link in links
-            ]
+            # 在页面内一次性收集所有链接，避免逐个元素往返调用
+            return await self.page.evaluate("""() => Array.from(
+                document.querySelectorAll('a[href]'),
+                a => ({text: (a.textContent || '').trim(), href: a.getAttribute('href')})
+            )""")
             
         except Exception as e:
-            logger.error(f"获取链接失败: {str(e)}")
+            logger.error("获取链接失败: %s", e)
             return []
     
+    async def _save_storage_state(self) -> None:
+        """将当前上下文的存储状态写入storage_path"""
+        try:
+            await self.context.storage_state(path=self.storage_path)
+        except Exception as e:
+            logger.error("保存存储状态失败: %s", e)
+    
+    async def _rotate_context(self) -> None:
+        """保留Cookie等存储状态，创建新的上下文和页面后再关闭当前上下文"""
+        state = await self.context.storage_state()
+        
+        # 新上下文和页面都创建成功后才替换，失败时当前上下文仍可用
+        new_context = await self.browser.new_context(
+            storage_state=state,
+            viewport=_DEFAULT_VIEWPORT
+        )
+        try:
+            new_page = await self._attach_page(await new_context.new_page())
+        except Exception:
+            await new_context.close()
+            raise
+        
+        old_context = self.context
+        self.context = new_context
+        self.page = new_page
+        self._ops_since_ctx_reset = 0
+        await old_context.close()
+        logger.info("浏览器上下文已重建")
+    
+    def force_gc(self) -> bool:
+        """
+        触发页面垃圾回收（需以--js-flags=--expose-gc启动Chrome）
+        
+        Returns:
+            bool: 是否执行成功
+        """
+        return _LOOP.run(self._force_gc())
+    
+    async def _force_gc(self) -> bool:
+        """force_gc的异步实现"""
+        if not self.page:
+            return False
+            
+        try:
+            await self.page.evaluate("() => { if (window.gc) gc(); }")
+            return True
+            
+        except Exception as e:
+            logger.error("触发垃圾回收失败: %s", e)
+            return False
+    
     def close(self):
-        """关闭浏览器连接"""
+        """关闭本实例的上下文（浏览器连接由连接池或共享方保留），并结束本实例启动的Chrome进程"""
+        _LOOP.run(self._close())
+        if self._proc is not None:
+            self._terminate_chrome()
+    
+    def _terminate_chrome(self) -> None:
+        """结束本实例启动的Chrome进程并丢弃连接池中对应的连接"""
+        proc, self._proc = self._proc, None
         try:
-            if self.page:
-                self.page.close()
-                self.page = None
-                
+            _terminate_process(proc)
+            _LOOP.run(chrome_pool.discard(self._port))
+            logger.info("Chrome进程已结束 (PID: %s)", proc.pid)
+        except Exception as e:
+            logger.error("结束Chrome进程失败: %s", e)
+    
+    async def _close(self) -> None:
+        """close的异步实现"""
+        try:
+            # 关闭上下文时其下的页面会一并关闭
             if self.context:
-                self.context.close()
-                self.context = None
-                
-            if self.browser:
-                self.browser.close()
-                self.browser = None
-                
-            if self.playwright:
-                self.playwright.stop()
-                self.playwright = None
+                if self.storage_path:
+                    await self._save_storage_state()
+                await self.context.close()
+            self.context = None
+            self.page = None
+            
+            # 共享的浏览器保留引用，以便之后重新创建上下文
+            self.browser = self._shared_browser
+            self.playwright = None
                 
             self.is_connected = False
             logger.info("Chrome连接已关闭")
             
         except Exception as e:
-            logger.error(f"关闭连接失败: {str(e)}")
+            logger.error("关闭连接失败: %s", e)
     
     def _find_chrome_executable(self) -> Optional[str]:
         """
@@ -415,35 +928,7 @@ class ChromeAutomation:
         Returns:
             str: Chrome可执行文件路径，找不到返回None
         """
-        chrome_paths = [
-            # Windows
-            r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-            r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-            os.path.expanduser(r"~\AppData\Local\Google\Chrome\Application\chrome.exe"),
-            
-            # macOS
-            "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-            
-            # Linux
-            "/usr/bin/google-chrome",
-            "/usr/bin/google-chrome-stable",
-            "/usr/bin/chromium-browser",
-            "/snap/bin/chromium",
-        ]
-        
-        for path in chrome_paths:
-            if os.path.exists(path):
-                return path
-        
-        # 尝试从PATH查找
-        try:
-            import shutil
-            chrome_path = shutil.which("chrome") or shutil.which("google-chrome") or shutil.which("chromium")
-            return chrome_path
-        except:
-            pass
-            
-        return None
+        return _locate_chrome()
     
     def __enter__(self):
         """上下文管理器入口"""
@@ -0,0 +1,38 @@
+"""
+测试公共fixture
+"""
+
+import os
+import sys
+import pytest
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.scripts.chrome_automation import ChromeAutomation, HAS_PLAYWRIGHT
+
+
+@pytest.fixture(scope="session")
+def chrome_instance():
+    """整个测试会话共享的Chrome实例，浏览器只启动一次"""
+    if not HAS_PLAYWRIGHT:
+        pytest.skip("Playwright未安装")
+
+    chrome = ChromeAutomation()
+    if not chrome.start_chrome_with_debug_port(headless=True):
+        pytest.skip("无法启动Chrome")
+
+    yield chrome
+    chrome.close()
+
+
+@pytest.fixture
+def fresh_context(chrome_instance):
+    """每个测试独立的浏览器上下文，与会话实例共享同一浏览器，测试结束只关闭该上下文"""
+    chrome = ChromeAutomation(browser=chrome_instance.browser)
+    if not chrome.acquire_context():
+        pytest.skip("无法创建浏览器上下文")
+
+    yield chrome
+    chrome.close()
@@ -0,0 +1,58 @@
+import os
+import sys
+import pytest
+from unittest.mock import patch
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src._paths import PROJECT_ROOT
+from src.config.app_config import AppConfig
+
+
+class TestAppConfig:
+    """应用配置测试类"""
+    
+    @pytest.fixture
+    def config(self, tmp_path):
+        """使用临时配置文件的配置实例"""
+        config_file = str(tmp_path / "config" / "app_config.json")
+        with patch.object(AppConfig, '_get_config_path', return_value=config_file):
+            return AppConfig()
+    
+    def test_set_invalidates_get_cache(self, config, tmp_path):
+        """测试set之后get返回新值而不是缓存的旧值"""
+        old_value = config.get('paths.logs')
+        new_value = str(tmp_path / "new_logs")
+        
+        config.set('paths.logs', new_value)
+        assert config.get('paths.logs') == new_value
+        assert config.get('paths.logs') != old_value
+        assert os.path.exists(config.config_file)
+    
+    def test_get_missing_key_not_cached(self, config):
+        """测试未命中的键不缓存，每次返回调用方给出的默认值"""
+        assert config.get('missing.key', 'first') == 'first'
+        assert config.get('missing.key', 'second') == 'second'
+        assert config.get('missing.key') is None
+    
+    def test_get_path_relative_to_project_root(self, config):
+        """测试相对路径以项目根目录为基准，截图目录与Chrome自动化共用"""
+        from src.scripts import chrome_automation as module
+        
+        with patch('src.config.app_config._resolve_and_mkdir', side_effect=lambda t, p, b: os.path.join(b, p)):
+            assert config.get_path('screenshots') == os.path.join(str(PROJECT_ROOT), "screenshots")
+            with patch.object(module, 'app_config', config):
+                assert module._screenshot_dir() == config.get_path('screenshots')
+    
+    def test_merge_config_nested(self, config):
+        """测试嵌套合并：用户配置的标量覆盖默认字典，未涉及的默认值保留"""
+        default = {'a': {'b': 1, 'c': {'d': 2}}, 'e': 3, 'f': {'g': 4}}
+        user = {'a': {'c': 5}, 'e': {'x': 1}, 'h': 6}
+        
+        merged = config._merge_config(default, user)
+        assert merged == {'a': {'b': 1, 'c': 5}, 'e': {'x': 1}, 'f': {'g': 4}, 'h': 6}
+        
+        # 默认配置不被修改
+        assert default == {'a': {'b': 1, 'c': {'d': 2}}, 'e': 3, 'f': {'g': 4}}
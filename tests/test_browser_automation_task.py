@@ -0,0 +1,101 @@
+import os
+import sys
+import threading
+import pytest
+from unittest.mock import patch, MagicMock
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+pytest.importorskip("PyQt5")
+
+from src.scripts import browser_automation_task as module
+from src.scripts.browser_automation_task import BrowserAutomationTask, PortResult
+
+
+class TestBrowserAutomationTask:
+    """浏览器自动化任务测试类"""
+    
+    def setup_method(self):
+        """每个测试方法前的设置"""
+        self.task = BrowserAutomationTask()
+        self.progress = []
+        self.logs = []
+        self.task.progress_updated.connect(self.progress.append)
+        self.task.log_batch.connect(self.logs.append)
+    
+    def _run(self, ports, perform):
+        """使用模拟的ChromeAutomation执行任务，返回按创建顺序排列的实例"""
+        instances = []
+        
+        def create():
+            instance = MagicMock()
+            instance.connect_to_chrome.return_value = True
+            instances.append(instance)
+            return instance
+        
+        with patch.object(module, 'ChromeAutomation', side_effect=create), \
+             patch.object(self.task, 'detect_chrome_instances', return_value=ports), \
+             patch.object(self.task, 'perform_automation_tasks', side_effect=perform), \
+             patch.object(self.task, 'generate_report', return_value=""):
+            self.task.run()
+        
+        return instances
+    
+    def test_each_port_gets_own_instance_and_is_closed(self):
+        """测试每个端口使用独立的实例，任务结束后实例被关闭"""
+        def perform(chrome_automation, port):
+            return PortResult(port=port, start_time="")
+        
+        instances = self._run([9222, 9223, 9224], perform)
+        
+        assert len(instances) == 3
+        assert sorted(i.connect_to_chrome.call_args.args[0] for i in instances) == [9222, 9223, 9224]
+        for instance in instances:
+            instance.close.assert_called_once()
+        assert sorted(r.port for r in self.task.task_results) == [9222, 9223, 9224]
+        assert not self.task._automations
+    
+    def test_failing_instance_does_not_abort_others(self):
+        """测试单个实例出错时记录错误，其余实例继续执行"""
+        def perform(chrome_automation, port):
+            if port == 9223:
+                raise RuntimeError("boom")
+            return PortResult(port=port, start_time="")
+        
+        instances = self._run([9222, 9223, 9224], perform)
+        
+        assert sorted(r.port for r in self.task.task_results) == [9222, 9224]
+        for instance in instances:
+            instance.close.assert_called_once()
+        assert any("处理Chrome实例 9223 时出错: boom" in text for text in self.logs)
+    
+    def test_progress_follows_schedule_in_completion_order(self):
+        """测试每完成一个实例按预先计算的进度表推进，与端口顺序无关"""
+        completed = []
+        done = {port: threading.Event() for port in (9222, 9223, 9224)}
+        
+        def perform(chrome_automation, port):
+            # 端口越小完成越晚：每个实例等待端口号更大的实例完成
+            if port < 9224:
+                assert done[port + 1].wait(5)
+            completed.append(port)
+            done[port].set()
+            return PortResult(port=port, start_time="")
+        
+        self._run([9222, 9223, 9224], perform)
+        
+        assert completed == [9224, 9223, 9222]
+        assert self.progress == [10, 20, 40, 60, 80, 90, 100]
+    
+    def test_detect_chrome_instances(self):
+        """测试按端口顺序返回处于监听状态的调试端口"""
+        listening = {9222, 9224, 9230}
+        with patch.object(module, '_is_port_listening', side_effect=lambda port: port in listening):
+            assert self.task.detect_chrome_instances() == [9222, 9224, 9230]
+    
+    def test_detect_chrome_instances_fallback(self):
+        """测试没有监听的端口时回退到默认端口9222"""
+        with patch.object(module, '_is_port_listening', return_value=False):
+            assert self.task.detect_chrome_instances() == [9222]
@@ -1,15 +1,16 @@
 import os
 import sys
+import asyncio
 import pytest
 import tempfile
 import shutil
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
 # 添加项目根目录到Python路径
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
-from src.scripts.chrome_automation import ChromeAutomation
+from src.scripts.chrome_automation import ChromeAutomation, _locate_chrome
 
 
 class TestChromeAutomation:
@@ -19,6 +20,7 @@ class TestChromeAutomation:
         """每个测试方法前的设置"""
         self.chrome_automation = ChromeAutomation()
         self.temp_dir = tempfile.mkdtemp()
+        _locate_chrome.cache_clear()
     
     def teardown_method(self):
         """每个测试方法后的清理"""
@@ -36,11 +38,21 @@ class TestChromeAutomation:
     
     def test_find_chrome_executable_windows(self):
         """测试在Windows上查找Chrome可执行文件"""
-        with patch('os.path.exists') as mock_exists:
+        with patch('os.path.exists') as mock_exists, patch('sys.platform', 'win32'):
             mock_exists.return_value = True
             result = self.chrome_automation._find_chrome_executable()
             assert result is not None
-            assert isinstance(result, str)
+            assert result.endswith("chrome.exe")
+    
+    def test_find_chrome_executable_checks_current_platform_only(self):
+        """测试只检查当前平台的安装路径"""
+        with patch('os.path.exists', return_value=False) as mock_exists, \
+             patch('sys.platform', 'darwin'), \
+             patch('shutil.which', return_value=None):
+            assert self.chrome_automation._find_chrome_executable() is None
+            mock_exists.assert_called_once_with(
+                "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
+            )
     
     def test_find_chrome_executable_not_found(self):
         """测试未找到Chrome可执行文件"""
@@ -116,46 +128,260 @@ class TestChromeAutomation:
         with ChromeAutomation() as chrome:
             assert isinstance(chrome, ChromeAutomation)
     
-    def test_parse_file_size(self):
-        """测试文件大小解析"""
-        from src.common.logging_config import _parse_file_size
+    def test_navigate_rotates_context(self):
+        """测试达到操作次数阈值后导航前重建上下文"""
+        chrome = self.chrome_automation
+        chrome.browser = AsyncMock()
+        chrome.context = AsyncMock()
+        chrome.page = AsyncMock()
+        chrome.is_connected = True
+        chrome.ctx_refresh_every = 2
+        old_context = chrome.context
+        
+        assert chrome.navigate_to_url("https://example.com") is True
+        chrome.browser.new_context.assert_not_called()
+        
+        assert chrome.navigate_to_url("https://example.com") is True
+        chrome.browser.new_context.assert_called_once()
+        assert chrome.browser.new_context.call_args.kwargs['storage_state'] == old_context.storage_state.return_value
+        assert chrome.context is chrome.browser.new_context.return_value
+        assert chrome._ops_since_ctx_reset == 0
+    
+    def test_rotate_context_failure_keeps_current_context(self):
+        """测试重建上下文失败时保留当前上下文，导航继续进行"""
+        chrome = self.chrome_automation
+        chrome.browser = AsyncMock()
+        chrome.context = AsyncMock()
+        chrome.page = AsyncMock()
+        chrome.is_connected = True
+        chrome.ctx_refresh_every = 1
+        old_context, old_page = chrome.context, chrome.page
+        new_context = chrome.browser.new_context.return_value
+        new_context.new_page.side_effect = Exception("new_page failed")
+        
+        assert chrome.navigate_to_url("https://example.com") is True
+        assert chrome.context is old_context
+        assert chrome.page is old_page
+        old_context.close.assert_not_called()
+        new_context.close.assert_awaited_once()
+        old_page.goto.assert_awaited_once()
+        assert chrome._ops_since_ctx_reset == 0
+    
+    def test_open_many_shares_browser(self):
+        """测试批量创建的实例共享浏览器且各自拥有独立上下文"""
+        from src.scripts import chrome_automation as module
+        
+        browser = AsyncMock()
+        browser.new_context.side_effect = lambda **kwargs: AsyncMock()
+        with patch.object(module, 'HAS_PLAYWRIGHT', True), \
+             patch.object(module.chrome_pool, 'get_browser', AsyncMock(return_value=browser)), \
+             patch.object(module.chrome_pool, 'get_playwright', AsyncMock()):
+            instances = ChromeAutomation.open_many(3)
+        
+        assert len(instances) == 3
+        assert all(instance.browser is browser for instance in instances)
+        assert len({id(instance.context) for instance in instances}) == 3
+        
+        context = instances[0].context
+        instances[0].close()
+        context.close.assert_awaited_once()
+        assert instances[0].page is None
+    
+    def test_block_resources_routes_requests(self):
+        """测试开启资源拦截后屏蔽指定类型的请求"""
+        chrome = ChromeAutomation(block_resources=True)
+        page = AsyncMock()
+        asyncio.run(chrome._attach_page(page))
+        page.route.assert_awaited_once_with("**/*", chrome._route_request)
+        
+        image_route = AsyncMock()
+        image_route.request.resource_type = "image"
+        doc_route = AsyncMock()
+        doc_route.request.resource_type = "document"
+        asyncio.run(chrome._route_request(image_route))
+        asyncio.run(chrome._route_request(doc_route))
+        image_route.abort.assert_awaited_once()
+        doc_route.continue_.assert_awaited_once()
+        
+        # 默认不拦截
+        page = AsyncMock()
+        asyncio.run(self.chrome_automation._attach_page(page))
+        page.route.assert_not_called()
+    
+    def test_take_screenshot_formats(self):
+        """测试截图默认使用jpeg，显式指定png时不传quality"""
+        chrome = self.chrome_automation
+        chrome.page = AsyncMock()
+        
+        path = chrome.take_screenshot()
+        assert path.endswith(".jpg")
+        kwargs = chrome.page.screenshot.call_args.kwargs
+        assert kwargs['type'] == "jpeg"
+        assert kwargs['quality'] == 70
+        
+        path = chrome.take_screenshot(fmt="png")
+        assert path.endswith(".png")
+        kwargs = chrome.page.screenshot.call_args.kwargs
+        assert kwargs['type'] == "png"
+        assert 'quality' not in kwargs
+        
+        # 指定文件名时按扩展名确定格式
+        chrome.take_screenshot("x.png")
+        assert chrome.page.screenshot.call_args.kwargs['type'] == "png"
+        chrome.take_screenshot("x.JPEG", fmt="png")
+        assert chrome.page.screenshot.call_args.kwargs['type'] == "jpeg"
+    
+    def test_click_element_uses_locator(self):
+        """测试点击通过locator一次完成等待和点击"""
+        chrome = self.chrome_automation
+        chrome.page = MagicMock()
+        locator = chrome.page.locator.return_value
+        locator.click = AsyncMock()
+        
+        assert chrome.click_element("#btn", timeout=3) is True
+        chrome.page.locator.assert_called_once_with("#btn")
+        locator.click.assert_awaited_once_with(timeout=3000)
+        chrome.page.wait_for_selector.assert_not_called()
+    
+    def test_get_element_text_queries_each_call(self):
+        """测试每次读取文本都重新查询元素并释放句柄，页面更新后不会返回旧文本"""
+        chrome = self.chrome_automation
+        chrome.page = AsyncMock()
+        handle = chrome.page.query_selector.return_value
+        handle.text_content.side_effect = ["old", "new"]
+        
+        assert chrome.get_element_text("#title") == "old"
+        assert chrome.get_element_text("#title") == "new"
+        assert chrome.page.query_selector.await_count == 2
+        assert handle.dispose.await_count == 2
+        
+        chrome.page.query_selector.return_value = None
+        assert chrome.get_element_text("#missing") is None
+    
+    def test_scroll_page_uses_mouse_wheel(self):
+        """测试滚动通过鼠标滚轮事件实现"""
+        chrome = self.chrome_automation
+        chrome.page = AsyncMock()
+        
+        assert chrome.scroll_page("up", 300) is True
+        chrome.page.mouse.wheel.assert_awaited_once_with(0, -300)
+        chrome.page.evaluate.assert_not_called()
+    
+    def test_storage_state_persisted(self, tmp_path):
+        """测试关闭时保存存储状态，下次创建上下文时加载"""
+        storage_path = str(tmp_path / "state.json")
+        browser = AsyncMock()
+        
+        chrome = ChromeAutomation(browser=browser, storage_path=storage_path)
+        assert chrome.acquire_context() is True
+        assert browser.new_context.call_args.kwargs['storage_state'] is None
+        
+        context = chrome.context
+        chrome.close()
+        context.storage_state.assert_awaited_once_with(path=storage_path)
         
-        assert _parse_file_size("10MB") == 10 * 1024 * 1024
-        assert _parse_file_size("1GB") == 1024 * 1024 * 1024
-        assert _parse_file_size("512KB") == 512 * 1024
-        assert _parse_file_size("1024B") == 1024
-        assert _parse_file_size("invalid") == 10 * 1024 * 1024  # 默认值
+        open(storage_path, 'w').close()
+        assert chrome.acquire_context() is True
+        assert browser.new_context.call_args.kwargs['storage_state'] == storage_path
 
 
 class TestChromeIntegration:
     """Chrome集成测试类"""
     
-    @pytest.fixture(scope="class")
-    def chrome_instance(self):
-        """Chrome实例fixture"""
-        chrome = ChromeAutomation()
-        yield chrome
-        chrome.close()
-    
-    def test_start_chrome(self):
+    def test_start_chrome(self, tmp_path):
         """测试启动Chrome"""
         chrome = ChromeAutomation()
         
-        # 模拟找到Chrome
+        # 模拟找到Chrome，端口上没有已运行的实例
         with patch.object(chrome, '_find_chrome_executable', return_value="chrome.exe"):
             with patch('subprocess.Popen') as mock_popen:
                 mock_popen.return_value = MagicMock()
-                with patch.object(chrome, 'connect_to_chrome', return_value=True):
-                    result = chrome.start_chrome_with_debug_port()
+                with patch.object(chrome, 'connect_to_chrome', side_effect=[False, True]) as mock_connect:
+                    result = chrome.start_chrome_with_debug_port(user_data_dir=str(tmp_path))
+                    assert result is True
+                    mock_popen.assert_called_once()
+                    # 首次探测静默进行
+                    assert mock_connect.call_args_list[0].kwargs == {'quiet': True}
+    
+    def test_start_chrome_reuses_running_instance(self):
+        """测试端口上已有Chrome时直接复用，不启动新进程"""
+        chrome = ChromeAutomation()
+        
+        with patch('subprocess.Popen') as mock_popen:
+            with patch.object(chrome, 'connect_to_chrome', return_value=True):
+                assert chrome.start_chrome_with_debug_port() is True
+                mock_popen.assert_not_called()
+    
+    def test_start_chrome_waits_for_devtools(self, tmp_path):
+        """测试启动新Chrome后等待stderr输出调试端点就绪提示再连接"""
+        chrome = ChromeAutomation()
+        
+        with patch.object(chrome, '_find_chrome_executable', return_value="chrome.exe"):
+            with patch('subprocess.Popen') as mock_popen:
+                mock_popen.return_value.stderr = iter([
+                    "[1234:5678:ERROR:foo.cc(1)] noise\n",
+                    "DevTools listening on ws://127.0.0.1:9222/devtools/browser/abc\n",
+                ])
+                with patch.object(chrome, 'connect_to_chrome', side_effect=[False, True]):
+                    result = chrome.start_chrome_with_debug_port(user_data_dir=str(tmp_path))
                     assert result is True
+                    mock_popen.assert_called_once()
+                    proc = mock_popen.return_value
+                    assert chrome._proc is proc
+                    assert mock_popen.call_args.kwargs['encoding'] == "utf-8"
+                    assert mock_popen.call_args.kwargs['errors'] == "replace"
+                    cmd = mock_popen.call_args.args[0]
+                    assert "--disable-background-networking" in cmd
+                    assert "--disable-gpu" not in cmd
+                    
+                    # 关闭时结束本实例启动的Chrome进程
+                    proc.poll.return_value = None
+                    chrome.close()
+                    proc.terminate.assert_called_once()
+                    assert chrome._proc is None
+    
+    def test_watch_devtools_banner(self):
+        """测试stderr出现监听提示或输出结束时就绪事件置位"""
+        from src.scripts.chrome_automation import _watch_devtools_banner
+        
+        proc = MagicMock()
+        proc.stderr = iter(["DevTools listening on ws://127.0.0.1:9222/devtools/browser/abc\n"])
+        assert _watch_devtools_banner(proc).wait(1) is True
+        
+        proc.stderr = iter([])
+        assert _watch_devtools_banner(proc).wait(1) is True
+    
+    def test_watch_devtools_banner_undecodable_output(self):
+        """测试stderr含无法解码的字节时仍能识别就绪提示"""
+        import io
+        from src.scripts.chrome_automation import _watch_devtools_banner
+        
+        proc = MagicMock()
+        proc.stderr = io.TextIOWrapper(
+            io.BytesIO(b"\xff\xfe bad bytes\nDevTools listening on ws://127.0.0.1:9222/devtools/browser/abc\n"),
+            encoding="utf-8",
+            errors="replace"
+        )
+        assert _watch_devtools_banner(proc).wait(1) is True
+        
+        # 读取过程中出错时也不会让等待方一直等到超时
+        proc.stderr = io.TextIOWrapper(io.BytesIO(b"\xff\xfe\n"), encoding="utf-8")
+        assert _watch_devtools_banner(proc).wait(1) is True
+    
+    def test_fresh_context_page_info(self, fresh_context):
+        """测试在共享浏览器的独立上下文中获取页面信息"""
+        assert fresh_context.navigate_to_url("about:blank") is True
+        info = fresh_context.get_page_info()
+        assert info['url'] == "about:blank"
     
     def test_start_chrome_not_found(self):
         """测试未找到Chrome时的启动"""
         chrome = ChromeAutomation()
         
         with patch.object(chrome, '_find_chrome_executable', return_value=None):
-            result = chrome.start_chrome_with_debug_port()
-            assert result is False
+            with patch.object(chrome, 'connect_to_chrome', return_value=False):
+                result = chrome.start_chrome_with_debug_port()
+                assert result is False
 
 
 if __name__ == "__main__":
@@ -0,0 +1,45 @@
+import os
+import sys
+import logging
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.common.logging_config import _parse_file_size, _resolve_level
+
+
+class TestLoggingConfig:
+    """日志配置测试类"""
+    
+    def test_resolve_level(self):
+        """测试日志级别解析，包括标准库别名和无法识别的名称"""
+        assert _resolve_level("DEBUG") == logging.DEBUG
+        assert _resolve_level("info") == logging.INFO
+        assert _resolve_level("WARN") == logging.WARNING
+        assert _resolve_level("FATAL") == logging.CRITICAL
+        assert _resolve_level("NOTSET") == logging.NOTSET
+        assert _resolve_level("verbose") == logging.INFO
+    
+    def test_parse_file_size(self):
+        """测试文件大小解析"""
+        assert _parse_file_size("10MB") == 10 * 1024 * 1024
+        assert _parse_file_size("1GB") == 1024 * 1024 * 1024
+        assert _parse_file_size("512KB") == 512 * 1024
+        assert _parse_file_size("1024B") == 1024
+        assert _parse_file_size(" 1.5 kb ") == 1536
+    
+    def test_parse_file_size_suffix(self):
+        """测试后缀按完整单位匹配，"10MB"不会被当作以B结尾的字节数"""
+        assert _parse_file_size("10MB") != 10
+        assert _parse_file_size("10mb") == 10 * 1024 * 1024
+        assert _parse_file_size("10 MB") == 10 * 1024 * 1024
+        assert _parse_file_size("2 gb") == 2 * 1024 * 1024 * 1024
+        assert _parse_file_size("64 Kb") == 64 * 1024
+        assert _parse_file_size("100 b") == 100
+    
+    def test_parse_file_size_invalid(self):
+        """测试无法解析的输入返回默认的10MB"""
+        default = 10 * 1024 * 1024
+        for value in ("invalid", "", "MB", "10", "10TB", "-5MB", "10 M B", "1.2.3MB"):
+            assert _parse_file_size(value) == default